@@ -27,9 +27,11 @@ except IOError:
     setup_file = os.path.join(os.path.dirname(__file__), os.pardir, 'setup.py')
 
     if os.path.exists(setup_file):
-        import imp
+        import importlib.util
 
-        setup = imp.load_source('pepper_setup', setup_file)
+        spec = importlib.util.spec_from_file_location('pepper_setup', setup_file)
+        setup = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(setup)
         version, sha = setup.get_version()
     else:
         version, sha = None, None
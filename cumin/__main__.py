@@ -2,8 +2,6 @@
 '''
 A CLI interface to a remote salt-api instance
 '''
-from __future__ import print_function
-
 import sys
 import logging
 
@@ -0,0 +1,188 @@
+"""
+An asyncio flavor of the low-level API, for fanning out many independent calls
+at once.
+
+Requires httpx (the ``async`` extra).
+"""
+import io
+import posixpath as urlpath
+import tarfile
+
+import httpx
+import requests
+
+from .api import (
+    _SaltApiBase, _DEFAULT_HEADERS, _encode_body, _httpx_verify, _json_decode,
+    PepperException, AuthenticationDenied, ServerError,
+)
+
+
+class SaltApiAsync(_SaltApiBase):
+    '''
+    Like SaltApi, but every call is a coroutine. One pooled (and, by default,
+    HTTP/2) connection is shared by every call, so independent requests can be
+    run concurrently:
+
+    >>> async with SaltApiAsync('https://localhost:8000') as api:
+    ...     await api.login('saltdev', 'saltdev', 'pam')
+    ...     pings, stats = await asyncio.gather(
+    ...         api.run([{'client': 'local', 'tgt': '*', 'fun': 'test.ping'}]),
+    ...         api.stats(),
+    ...     )
+
+    The synchronous SaltApi remains the general-purpose client; this is for
+    batched workloads. Kerberos authentication and events() are not supported.
+    '''
+
+    def __init__(self, api_url, *, cache=None, ssl_verify=False, connect_timeout=None,
+                 http2=True, max_connections=20):
+        '''
+        Takes the same arguments as SaltApi, plus:
+
+        :param http2: Negotiate HTTP/2 (requires the h2 package)
+
+        :param max_connections: Upper bound on concurrent connections
+        '''
+        super().__init__(
+            api_url, cache=cache, ssl_verify=ssl_verify, connect_timeout=connect_timeout,
+        )
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            verify=_httpx_verify(ssl_verify),
+            headers=_DEFAULT_HEADERS,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=httpx.Timeout(None, connect=connect_timeout),
+            # requests does this by default, and SaltApi relies on it
+            follow_redirects=True,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        '''
+        Close the underlying HTTP client and its pooled connections.
+        '''
+        await self.client.aclose()
+
+    def _auth_headers(self, data):
+        eauth = data['eauth'] if data is not None and 'eauth' in data else self._auth_eauth
+        if eauth == 'kerberos':
+            raise PepperException("Kerberos authentication is not supported by SaltApiAsync")
+        elif self._token_auth is not None:
+            return {'X-Auth-Token': self._token_auth.token}
+
+    async def _mkrequest(self, method, path, data=None, headers=None):
+        '''
+        Send a request to salt-api and return the response.
+
+        :rtype: httpx.Response
+        '''
+        body, headers = _encode_body(data, headers)
+        auth_headers = self._auth_headers(data)
+        if auth_headers:
+            headers = {**auth_headers, **headers} if headers else auth_headers
+
+        resp = await self.client.request(
+            method,
+            self._construct_url(path),
+            headers=headers,
+            content=body,
+        )
+        if resp.status_code == 401:
+            raise AuthenticationDenied(resp.text)
+        elif resp.status_code == 500:
+            raise ServerError(resp.text)
+        elif resp.status_code >= 400:
+            # Raise what SaltApi would, not httpx's own exception
+            try:
+                resp.raise_for_status()
+            except httpx.HTTPStatusError as exc:
+                raise requests.HTTPError(str(exc)) from exc
+        return resp
+
+    async def run(self, cmds):
+        '''
+        Execute a command through salt-api and return the response
+
+        :param list cmds: a list of command dictionaries
+        '''
+        return _json_decode((await self._mkrequest('POST', '/', cmds)).content)
+
+    async def login(self, username, password, eauth):
+        body = _json_decode((await self._mkrequest('POST', '/login', {
+            'username': username,
+            'password': password,
+            'eauth': eauth,
+        })).content)
+        self.auth = body['return'][0]
+        self.authcache.set_auth(self.auth)
+        return self.auth
+
+    async def logout(self):
+        await self._mkrequest('POST', '/logout')
+        self.auth = {}
+
+    async def run_unsessioned(self, cmds):
+        '''
+        Execute a command through salt-api and return the response, bypassing
+        the usual session mechanisms. See SaltApi.run_unsessioned().
+
+        :param list cmds: a list of command dictionaries
+        '''
+        return _json_decode((await self._mkrequest('POST', '/run', cmds)).content)
+
+    async def minions(self, mid):
+        if mid is ...:
+            path = '/minions'
+        else:
+            path = urlpath.join('/minions', mid)
+        return _json_decode((await self._mkrequest('GET', path)).content)
+
+    async def run_async(self, cmds):
+        '''
+        Start an execution command and immediately return the job id. See
+        SaltApi.run_async().
+
+        :param list cmds: a list of command dictionaries
+        '''
+        return _json_decode((await self._mkrequest('POST', '/minions', cmds)).content)
+
+    async def jobs(self, jid):
+        if jid is ...:
+            path = '/jobs'
+        else:
+            path = urlpath.join('/jobs', jid)
+        return _json_decode((await self._mkrequest('GET', path)).content)
+
+    async def keys(self, mid):
+        if mid is ...:
+            path = '/keys'
+        else:
+            path = urlpath.join('/keys', mid)
+        return _json_decode((await self._mkrequest('GET', path)).content)
+
+    async def key_gen(self, mid, **kwargs):
+        """
+        See SaltApi.key_gen()
+        """
+        form = {
+            'mid': mid,
+        }
+        form.update(kwargs)
+        resp = await self._mkrequest('POST', '/keys', form)
+        buf = io.BytesIO(resp.content)
+        return tarfile.open(fileobj=buf, mode='r')
+
+    async def hook(self, path, body):
+        hookpath = urlpath.join('/hook', path)
+        await self._mkrequest('POST', hookpath, body)
+
+    async def stats(self):
+        return _json_decode((await self._mkrequest('GET', '/stats')).content)
@@ -3,9 +3,13 @@ A low-level API exposing the salt-api HTTP calls fairly directly.
 """
 import json
 import logging
-import urllib.parse as urlparse
+import os
+import ssl
+from urllib.parse import urlsplit
 import posixpath as urlpath
 import requests
+import requests.adapters
+from urllib3.util.retry import Retry
 import tarfile
 import io
 from .config import NullCache
@@ -13,18 +17,100 @@ from .sse import stream_sse
 
 logger = logging.getLogger('pepper')
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_DEFAULT_HEADERS = {
+    'Accept': 'application/json',
+    'X-Requested-With': 'XMLHttpRequest',
+}
+
+# Only sent along with a body
+_JSON_BODY_HEADERS = {
+    'Content-Type': 'application/json',
+}
+
+# Endpoints without a variable part, whose URLs are worked out up front
+_STATIC_ENDPOINTS = (
+    '/', '/login', '/logout', '/run', '/minions', '/jobs', '/keys', '/stats', '/events',
+)
+
+_stdlib_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+
+def _json_encode(data):
+    """
+    Serializes data to compact UTF-8 JSON, using orjson if it's available.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data)
+        except TypeError:
+            # Something orjson won't handle (eg, huge ints); let the stdlib try
+            pass
+    return _stdlib_encode(data).encode('utf-8')
+
+
+def _json_decode(buf):
+    """
+    Parses JSON from bytes or str.
+
+    Always the stdlib: orjson turns integers wider than 64 bits into floats,
+    which would silently change the data salt-api returns.
+    """
+    return json.loads(buf)
+
+
+def _encode_body(data, headers):
+    """
+    Returns the request body and headers for data, which may be None to send no
+    body (and no Content-Type) at all.
+    """
+    if data is None:
+        return None, headers
+    if headers:
+        headers = {**_JSON_BODY_HEADERS, **headers}
+    else:
+        headers = _JSON_BODY_HEADERS
+    return _json_encode(data), headers
+
+
+def _httpx_verify(ssl_verify):
+    """
+    Converts an ssl_verify setting to something httpx takes as verify=: bools
+    pass through, while a path to a CA bundle (or directory of CAs) becomes an
+    SSLContext, as httpx no longer accepts paths itself.
+    """
+    if not isinstance(ssl_verify, str):
+        return ssl_verify
+    if os.path.isdir(ssl_verify):
+        return ssl.create_default_context(capath=ssl_verify)
+    return ssl.create_default_context(cafile=ssl_verify)
+
 
 class SaltTokenAuth(requests.auth.AuthBase):
+    __slots__ = ('token',)
+
     def __init__(self, token):
         super().__init__()
+        if not token:
+            raise ValueError("SaltTokenAuth requires a token")
         self.token = token
 
     def __call__(self, request):
-        if self.token:
-            request.headers.setdefault('X-Auth-Token', self.token)
+        # setdefault() so a caller-supplied X-Auth-Token still wins
+        request.headers.setdefault('X-Auth-Token', self.token)
         return request
 
 
+def _make_kerberos_auth():
+    # requests_kerberos is an optional dependency
+    from requests_kerberos import HTTPKerberosAuth, OPTIONAL
+    return HTTPKerberosAuth(mutual_authentication=OPTIONAL)
+
+
 class PepperException(Exception):
     pass
 
@@ -41,7 +127,72 @@ class ServerError(PepperException):
     """
 
 
-class SaltApi(object):
+class _SaltApiBase(object):
+    '''
+    The transport-independent parts of the salt-api wrappers: URL handling and
+    authentication state.
+    '''
+
+    def __init__(self, api_url, *, cache=None, ssl_verify=False, connect_timeout=None):
+        split = urlsplit(api_url)
+        if split.scheme not in ['http', 'https']:
+            raise ValueError("salt-api URL missing HTTP(s) protocol: {0}".format(api_url))
+
+        if cache is None:
+            self.authcache = NullCache(None)
+        else:
+            self.authcache = cache
+
+        self.api_url = api_url
+        self._url_base = api_url if api_url.endswith('/') else api_url + '/'
+        self._static_urls = {
+            path: self._url_base + path.lstrip('/') for path in _STATIC_ENDPOINTS
+        }
+        self._ssl_verify = ssl_verify
+        self.connect_timeout = connect_timeout
+        self.auth = self.authcache.get_auth() or {}
+
+    def _construct_url(self, path):
+        '''
+        Construct the url to salt-api for the given path
+
+        Args:
+            path: the path to the salt-api resource
+
+        >>> api = Pepper('https://localhost:8000/salt-api/')
+        >>> api._construct_url('/login')
+        'https://localhost:8000/salt-api/login'
+        '''
+
+        url = self._static_urls.get(path)
+        if url is None:
+            url = self._url_base + path.lstrip('/')
+        return url
+
+    @property
+    def auth(self):
+        '''
+        The auth dictionary from login() or the cache (see
+        AbstractCache.get_auth()), or {} if there is none.
+
+        The token and eauth are read from it when it's assigned, so
+        modifying it in place (eg, api.auth['token'] = ...) has no effect on
+        requests; assign a new dictionary instead.
+        '''
+        return self._auth
+
+    @auth.setter
+    def auth(self, value):
+        # Everything requests need from the auth dict is worked out here, once,
+        # instead of on every request
+        self._auth = value
+        value = value or {}
+        self._auth_eauth = value.get('eauth')
+        token = value.get('token')
+        self._token_auth = SaltTokenAuth(token) if token else None
+
+
+class SaltApi(_SaltApiBase):
     '''
     A thin wrapper for making HTTP calls to the salt-api rest_cherrpy REST
     interface
@@ -70,7 +221,8 @@ class SaltApi(object):
 
     '''
 
-    def __init__(self, api_url, *, cache=None, ssl_verify=False, connect_timeout=None):
+    def __init__(self, api_url, *, cache=None, ssl_verify=False, connect_timeout=None,
+                 transport='requests'):
         '''
         Initialize the class with the URL of the API
 
@@ -79,51 +231,70 @@ class SaltApi(object):
 
         :param ssl_verify: A bool or string pointing to something that looks like a CA or trust store
 
+        :param transport: 'requests' (the default), or 'http2' to use httpx
+            and multiplex calls over one HTTP/2 connection (no Kerberos support)
+
         :raises ValueError: if the api_url is misformed
 
         '''
-        split = urlparse.urlsplit(api_url)
-        if split.scheme not in ['http', 'https']:
-            raise ValueError("salt-api URL missing HTTP(s) protocol: {0}".format(api_url))
-
-        if cache is None:
-            self.authcache = NullCache(None)
-        else:
-            self.authcache = cache
+        super().__init__(
+            api_url, cache=cache, ssl_verify=ssl_verify, connect_timeout=connect_timeout,
+        )
+        self._kerberos_auth = None
+        self.transport = transport
+        if transport == 'http2':
+            from .http2 import Http2Session
+            self.session = Http2Session(
+                verify=_httpx_verify(ssl_verify), headers=_DEFAULT_HEADERS,
+            )
+            return
+        elif transport != 'requests':
+            raise ValueError("Unknown transport: {0}".format(transport))
 
-        self.api_url = api_url
-        self._ssl_verify = ssl_verify
-        self.connect_timeout = connect_timeout
-        self.auth = self.authcache.get_auth() or {}
         self.session = requests.Session()
+        self.session.verify = ssl_verify
+        self.session.headers.update(_DEFAULT_HEADERS)
+        # Only idempotent requests are retried on these statuses (urllib3's
+        # default allowed_methods); connection failures are retried for all.
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
-    def _construct_url(self, path):
-        '''
-        Construct the url to salt-api for the given path
+    def __enter__(self):
+        return self
 
-        Args:
-            path: the path to the salt-api resource
+    def __exit__(self, *exc):
+        self.close()
 
-        >>> api = Pepper('https://localhost:8000/salt-api/')
-        >>> api._construct_url('/login')
-        'https://localhost:8000/salt-api/login'
+    def close(self):
         '''
-
-        relative_path = path.lstrip('/')
-        return urlparse.urljoin(self.api_url, relative_path)
+        Close the underlying HTTP session and its pooled connections.
+        '''
+        self.session.close()
 
     def _find_auth(self, data):
-        eauth = data['eauth'] if data is not None and 'eauth' in data else self.auth.get('eauth')
+        eauth = data['eauth'] if data is not None and 'eauth' in data else self._auth_eauth
         if eauth == 'kerberos':
-            from requests_kerberos import HTTPKerberosAuth, OPTIONAL
-            return HTTPKerberosAuth(mutual_authentication=OPTIONAL)
-        elif self.auth and self.auth.get('token'):
-            return SaltTokenAuth(self.auth['token'])
+            if self.transport != 'requests':
+                raise PepperException("Kerberos authentication requires the requests transport")
+            if self._kerberos_auth is None:
+                self._kerberos_auth = _make_kerberos_auth()
+            return self._kerberos_auth
         # Don't do this because of the use of sessionless salt-api
-        # else:
+        # if self._token_auth is None:
         #     raise MissingLogin
+        return self._token_auth
 
-    def _mkrequest(self, method, path, data=None, headers={}, **kwargs):
+    def _mkrequest(self, method, path, data=None, headers=None, stream=False, **kwargs):
         '''
         A thin wrapper around request and request_kerberos to send
         requests and return the response
@@ -131,33 +302,38 @@ class SaltApi(object):
         If the current instance contains an authentication token it will be
         attached to the request as a custom header.
 
+        With stream=True the body is left unread, to be consumed incrementally
+        (eg, by the SSE reader).
+
         :rtype: response
 
         '''
         auth = self._find_auth(data)
-        head = {
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
-            'X-Requested-With': 'XMLHttpRequest',
-        }
-        head.update(headers)
+        body, headers = _encode_body(data, headers)
 
         resp = getattr(self.session, method)(
             url=self._construct_url(path),
-            headers=head,
+            headers=headers,
+            # Passed explicitly so REQUESTS_CA_BUNDLE can't override a disabled verify
             verify=self._ssl_verify,
             auth=auth,
-            data=json.dumps(data),
+            data=body,
             timeout=(self.connect_timeout, None),
+            stream=stream,
             **kwargs
         )
+        # On errors, release the connection before raising; a streamed
+        # response would otherwise hold it until garbage collected.
         if resp.status_code == 401:
-            raise AuthenticationDenied(resp.text)
+            with resp:
+                raise AuthenticationDenied(resp.text)
         elif resp.status_code == 500:
-            raise ServerError(resp.text)
-        else:
-            resp.raise_for_status()
-            return resp
+            with resp:
+                raise ServerError(resp.text)
+        elif resp.status_code >= 400:
+            with resp:
+                resp.raise_for_status()
+        return resp
 
     def run(self, cmds):
         '''
@@ -165,21 +341,21 @@ class SaltApi(object):
 
         :param list cmds: a list of command dictionaries
         '''
-        body = self._mkrequest('post', '/', cmds).json()
+        body = _json_decode(self._mkrequest('post', '/', cmds).content)
         return body
 
     def login(self, username, password, eauth):
-        body = self._mkrequest('post', '/login', {
+        body = _json_decode(self._mkrequest('post', '/login', {
             'username': username,
             'password': password,
             'eauth': eauth,
-        }).json()
+        }).content)
         self.auth = body['return'][0]
         self.authcache.set_auth(self.auth)
         return self.auth
 
     def logout(self):
-        self._mkrequest('post', '/logout').json()
+        self._mkrequest('post', '/logout')
         self.auth = {}
 
     def run_unsessioned(self, cmds):
@@ -194,14 +370,14 @@ class SaltApi(object):
 
         :param list cmds: a list of command dictionaries
         '''
-        return self._mkrequest('post', '/run', cmds).json()
+        return _json_decode(self._mkrequest('post', '/run', cmds).content)
 
     def minions(self, mid):
         if mid is ...:
             path = '/minions'
         else:
             path = urlpath.join('/minions', mid)
-        return self._mkrequest('get', path).json()
+        return _json_decode(self._mkrequest('get', path).content)
 
     def run_async(self, cmds):
         '''
@@ -212,21 +388,21 @@ class SaltApi(object):
 
         :param list cmds: a list of command dictionaries
         '''
-        return self._mkrequest('post', '/minions', cmds).json()
+        return _json_decode(self._mkrequest('post', '/minions', cmds).content)
 
     def jobs(self, jid):
         if jid is ...:
             path = '/jobs'
         else:
             path = urlpath.join('/jobs', jid)
-        return self._mkrequest('get', path).json()
+        return _json_decode(self._mkrequest('get', path).content)
 
     def keys(self, mid):
         if mid is ...:
             path = '/keys'
         else:
             path = urlpath.join('/keys', mid)
-        return self._mkrequest('get', path).json()
+        return _json_decode(self._mkrequest('get', path).content)
 
     def key_gen(self, mid, **kwargs):
         """
@@ -256,7 +432,7 @@ class SaltApi(object):
         self._mkrequest('post', hookpath, body)
 
     def stats(self):
-        return self._mkrequest('get', '/stats').json()
+        return _json_decode(self._mkrequest('get', '/stats').content)
 
     def events(self):
         """
@@ -275,5 +451,5 @@ class SaltApi(object):
 
         """
         for msg in stream_sse(self._mkrequest, 'get', '/events'):
-            data = json.loads(msg['data'])
+            data = _json_decode(msg['data'])
             yield data
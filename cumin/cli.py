@@ -35,23 +35,24 @@ class PepperCli(object):
         parser = argparse.ArgumentParser(
             description=__doc__)
         parser.add_argument('--version', action='version', version='%(prog)s ' + __version__)
-        return parser
 
-    def parse(self):
-        '''
-        Parse all args
-        '''
-        self.parser.add_argument(
+        parser.add_argument(
             '-c', dest='config', default=None,
             help='Configuration file location. Default is a file path in the '
                  '"PEPPERRC" environment variable or ~/.pepperrc.',
         )
 
-        self.parser.add_argument(
+        parser.add_argument(
             '-v', dest='verbose', default=0, action='count',
             help='Increment output verbosity; may be specified multiple times',
         )
 
+        return parser
+
+    def parse(self):
+        '''
+        Parse all args
+        '''
         self.options = self.parser.parse_args()
 
     def add_globalopts(self):
@@ -249,8 +250,9 @@ class PepperCli(object):
         load_config_environ(config)
 
         for arg, conf in self.CONFIG_MAP.items():
-            if getattr(self.options, arg, None):
-                config[conf] = getattr(self.options, arg, None)
+            value = getattr(self.options, arg, None)
+            if value:
+                config[conf] = value
 
         load_config_tui(config)
 
@@ -294,8 +296,10 @@ class PepperCli(object):
             })
         return opts
 
+    _encoder = json.JSONEncoder(indent=4, sort_keys=True)
+
     def format_response(self, data):
-        return json.dumps(data, indent=4, sort_keys=True)
+        return self._encoder.encode(data)
 
     def run(self):
         '''
@@ -317,28 +321,29 @@ class PepperCli(object):
             auto_login=True,
         )
 
-        if self.options.json_input:
-            data = json.loads(self.options.json_input)
-            res = self.client.api.run(data)
-            yield None, self.format_response(res)
-        elif self.options.events:
-            for ev in self.client.events():
-                yield None, self.format_response(ev)
-        elif self.options.client == 'local_async':
-            minions, results = self.client.local_async(**args)
-            start = time.time()
-            end = start + self.options.timeout
-            for mid, res in results:
-                if mid is not None:
-                    minions.remove(mid)
-                    yield None, self.format_response({mid: res})
-                    if not minions:
+        with self.client:
+            if self.options.json_input:
+                data = json.loads(self.options.json_input)
+                res = self.client.api.run(data)
+                yield None, self.format_response(res)
+            elif self.options.events:
+                for ev in self.client.events():
+                    yield None, self.format_response(ev)
+            elif self.options.client == 'local_async':
+                minions, results = self.client.local_async(**args)
+                start = time.time()
+                end = start + self.options.timeout
+                for mid, res in results:
+                    if mid is not None:
+                        minions.remove(mid)
+                        yield None, self.format_response({mid: res})
+                        if not minions:
+                            break
+                    if time.time() > end:
                         break
-                if time.time() > end:
-                    break
-            if minions:
-                ret = 1 if self.options.fail_if_minions_dont_respond else 0
-                yield ret, "No response from {}".format(', '.join(minions))
-        else:
-            res = getattr(self.client, self.options.client)(**args)
-            yield None, self.format_response(res)
+                if minions:
+                    ret = 1 if self.options.fail_if_minions_dont_respond else 0
+                    yield ret, "No response from {}".format(', '.join(minions))
+            else:
+                res = getattr(self.client, self.options.client)(**args)
+                yield None, self.format_response(res)
@@ -1,6 +1,7 @@
 """
 A mid-level client to make executing commands easier.
 """
+import time
 from collections import ChainMap
 from .api import SaltApi
 from .config import standard_configuration, NullCache
@@ -11,6 +12,14 @@ def _dict_filter_none(**kwarg):
 
 
 class Client:
+    """
+    Holds one HTTP session for its lifetime, so connections are reused across
+    calls. Use it as a context manager to close them when done:
+
+        with Client() as c:
+            c.local('*', 'test.ping')
+    """
+
     def __init__(self, api_url=None, *, config=None, cache=None, auto_login=True):
         """
         * api_url: URL to use, defaulting to one loaded from configuration
@@ -31,6 +40,15 @@ class Client:
         if auto_login and self.config['user'] and not self.api.auth:
             self.login(self.config['user'], self.config['password'], self.config['eauth'])
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        return self.api.close()
+
     def login(self, username, password, eauth):
         return self.api.login(username, password, eauth)
 
@@ -58,13 +76,14 @@ class Client:
         )])['return'][0]
 
     def local_async(self, tgt, fun, arg=None, kwarg=None, tgt_type='glob',
-                    timeout=None, ret=None):
+                    timeout=None, ret=None, *, poll_interval=0.5):
         """
         Run a single execution function on one or more minions and a generator
         producing (mid, result) pairs as they are available. (Or (None, None) if
         no new minions have responded.)
 
-        NOTE: Every loop through the generator is an API call.
+        NOTE: Every loop through the generator is an API call. Calls are spaced
+        at least poll_interval seconds apart; the generator sleeps as needed.
         """
         body = self.api.run([_dict_filter_none(
             client='local_async',
@@ -81,7 +100,13 @@ class Client:
 
         def asynciter():
             waiting_for = set(minions)
+            last_poll = None
             while waiting_for:
+                if last_poll is not None:
+                    delay = last_poll + poll_interval - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                last_poll = time.monotonic()
                 # Note: runner:jobs.lookup_jid gives this to us directly, but
                 # requires runner permissions
                 status = self.api.jobs(jid)['info'][0]
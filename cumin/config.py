@@ -5,13 +5,18 @@ import os
 import abc
 import json
 import time
-import getpass
+import functools
 import collections.abc
-from configparser import ConfigParser
+from types import MappingProxyType
 from .utils import umask
 
+_DEFAULT_PEPPERRC = os.path.expanduser('~/.pepperrc')
+_DEFAULT_PEPPERCACHE = os.path.expanduser('~/.peppercache')
+
+_MISSING = object()
+
 DEFAULT_SETTINGS = {
-    'cache': os.path.expanduser('~/.peppercache'),
+    'cache': _DEFAULT_PEPPERCACHE,
     'url': 'https://localhost:8000/',
     'user': None,
     'password': None,
@@ -22,6 +27,8 @@ DEFAULT_SETTINGS = {
 
 
 class AbstractCache(abc.ABC):
+    __slots__ = ('config',)
+
     def __init__(self, config):
         self.config = config
 
@@ -58,6 +65,7 @@ class NullCache(AbstractCache):
     """
     Implements the cache interface, but does nothing.
     """
+    __slots__ = ()
 
     def get_auth(self):
         return None
@@ -70,22 +78,35 @@ class FileCache(AbstractCache):
     """
     Handles caching the credentials in a file (default is ~/.peppercache)
     """
+    __slots__ = ('token_file', '_cached', '_cached_mtime')
 
     def __init__(self, config):
         super().__init__(config)
         self.token_file = config['cache']
+        # Parsed contents of token_file, valid while its mtime is unchanged
+        self._cached = None
+        self._cached_mtime = None
 
     def get_auth(self):
-        if self.token_file and os.path.exists(self.token_file):
-            with open(self.token_file, 'rt') as f:
+        if not self.token_file:
+            return
+        try:
+            mtime = os.stat(self.token_file).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if self._cached is None or mtime != self._cached_mtime:
+            with open(self.token_file, 'rb') as f:
                 try:
-                    auth = json.load(f)
+                    auth = json.loads(f.read())
                 except json.decoder.JSONDecodeError:
                     # Assuming the file is corrupt. Eating the exception
                     return
-            if auth['expire'] < time.time() + 30:  # XXX: Why +30?
-                return
-            return auth
+            self._cached = auth
+            self._cached_mtime = mtime
+        auth = self._cached
+        if auth['expire'] < time.time() + 30:  # XXX: Why +30?
+            return
+        return auth
 
     def set_auth(self, auth):
         # A bunch of extra work to set file permissions without having a window of leak
@@ -93,12 +114,15 @@ class FileCache(AbstractCache):
             fdsc = os.open(self.token_file, os.O_WRONLY | os.O_CREAT, 0o600)
             with os.fdopen(fdsc, 'wt') as f:
                 json.dump(auth, f)
+        self._cached = auth
+        self._cached_mtime = os.stat(self.token_file).st_mtime_ns
 
 
 class Config(collections.abc.MutableMapping):
     """
     Configuration that just initializes itself from default values.
     """
+    __slots__ = ('_data',)
 
     def __init__(self):
         self._init_from_defaults()
@@ -113,10 +137,11 @@ class Config(collections.abc.MutableMapping):
         self._data[key] = data
 
     def __delitem__(self, key):
-        if key in DEFAULT_SETTINGS:
-            self._data[key] = DEFAULT_SETTINGS[key]
-        else:
+        default = DEFAULT_SETTINGS.get(key, _MISSING)
+        if default is _MISSING:
             del self._data[key]
+        else:
+            self._data[key] = default
 
     def __iter__(self):
         yield from self._data
@@ -124,6 +149,57 @@ class Config(collections.abc.MutableMapping):
     def __len__(self):
         return len(self._data)
 
+    def copy(self):
+        new = type(self).__new__(type(self))
+        new._data = self._data.copy()
+        return new
+
+
+PEPPERRC_CONFIG_MAP = {
+    'saltapi_user': 'user',
+    'saltapi_pass': 'password',
+    'saltapi_eauth': 'eauth',
+    'saltapi_url': 'url',
+    'saltapi_ssl_verify': 'verify',
+    'saltapi_timeout': 'connect_timeout',
+}
+
+_EMPTY_SECTION = MappingProxyType({})
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_pepperrc_cached(filename, mtime_ns, size):
+    """
+    Parses the main section of a pepperrc file into a read-only mapping, which
+    is shared by every caller.
+
+    mtime_ns and size are only used as part of the cache key, so that edits to
+    the file are picked up.
+    """
+    from configparser import ConfigParser
+    with open(filename, 'rt') as f:
+        buf = f.read()
+    cp = ConfigParser(interpolation=None)
+    cp.read_string(buf, source=filename)
+    if 'main' not in cp:
+        return _EMPTY_SECTION
+    return MappingProxyType(dict(cp['main']))
+
+
+def _read_pepperrc(filename):
+    """
+    Returns the main section of a pepperrc file as a read-only mapping, parsing
+    it only if it changed since the last read.
+    """
+    # Missing, a directory, unreadable, ...: no configuration from it. This is
+    # caught out here because lru_cache doesn't remember exceptions, so a file
+    # made readable again (which changes neither mtime nor size) is picked up.
+    try:
+        st = os.stat(filename)
+        return _parse_pepperrc_cached(filename, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return _EMPTY_SECTION
+
 
 def load_config_pepperrc(config, filename=None):
     """
@@ -131,24 +207,22 @@ def load_config_pepperrc(config, filename=None):
     overridable by environment variables.
     """
 
-    CONFIG_MAP = {
-        'saltapi_user': 'user',
-        'saltapi_pass': 'password',
-        'saltapi_eauth': 'eauth',
-        'saltapi_url': 'url',
-        'saltapi_ssl_verify': 'verify',
-        'saltapi_timeout': 'connect_timeout',
-    }
-
-    if not filename:
-        filename = os.path.expanduser('~/.pepperrc')
-
-    cp = ConfigParser(interpolation=None)
-    cp.read(filename)
-    if 'main' in cp:
-        for k, v in cp['main'].items():
-            if k in CONFIG_MAP:
-                config[CONFIG_MAP[k]] = v
+    parsed = _read_pepperrc(filename or _DEFAULT_PEPPERRC)
+    for rckey, confkey in PEPPERRC_CONFIG_MAP.items():
+        v = parsed.get(rckey)
+        if v is not None:
+            config[confkey] = v
+
+
+ENVIRON_CONFIG_MAP = {
+    'SALTAPI_USER': 'user',
+    'SALTAPI_PASS': 'password',
+    'SALTAPI_EAUTH': 'eauth',
+    'SALTAPI_URL': 'url',
+    'SALTAPI_SSL_VERIFY': 'verify',
+    'SALTAPI_TIMEOUT': 'connect_timeout',
+    'PEPPERCACHE': 'cache',
+}
 
 
 def load_config_environ(config, environ=None):
@@ -156,28 +230,24 @@ def load_config_environ(config, environ=None):
     Loads configurations from process environmnet (default os.environ)
     """
 
-    CONFIG_MAP = {
-        'SALTAPI_USER': 'user',
-        'SALTAPI_PASS': 'password',
-        'SALTAPI_EAUTH': 'eauth',
-        'SALTAPI_URL': 'url',
-        'SALTAPI_SSL_VERIFY': 'verify',
-        'SALTAPI_TIMEOUT': 'connect_timeout',
-        'PEPPERCACHE': 'cache',
-    }
-
     if environ is None:  # Don't overwrite {}
         environ = os.environ
 
-    for k, v in environ.items():
-        if k in CONFIG_MAP:
-            config[CONFIG_MAP[k]] = v
+    for envkey, confkey in ENVIRON_CONFIG_MAP.items():
+        v = environ.get(envkey)
+        if v is not None:
+            config[confkey] = v
 
 
 def load_config_tui(config):
     """
     Prompts the user for information.
     """
+    if config['user'] and config['password']:
+        # Everything came from elsewhere; don't bother setting up prompts
+        return
+
+    import getpass
 
     PROMPTERS = {
         'user': lambda: input('Username: '),
@@ -192,6 +262,18 @@ def load_config_tui(config):
             config[field] = prompter()
 
 
+def _build_standard_configuration(pepperrc, environ):
+    config = Config()
+    load_config_pepperrc(config, pepperrc)
+    load_config_environ(config, environ)
+    return config
+
+
+@functools.lru_cache(maxsize=1)
+def _default_standard_configuration():
+    return _build_standard_configuration(None, None)
+
+
 def standard_configuration(*, pepperrc=None, environ=None):
     """
     Builds a standard configuration, suitable for most API clients.
@@ -200,8 +282,12 @@ def standard_configuration(*, pepperrc=None, environ=None):
     1. Process environment
     2. .pepperrc file
     3. Hard-coded defaults
+
+    When called without arguments, the configuration is only built once per
+    process and each call gets its own copy of it. Later changes to the
+    environment or ~/.pepperrc are not seen; pass pepperrc or environ
+    explicitly to get a fresh read.
     """
-    config = Config()
-    load_config_pepperrc(config, pepperrc)
-    load_config_environ(config, environ)
-    return config
+    if pepperrc is None and environ is None:
+        return _default_standard_configuration().copy()
+    return _build_standard_configuration(pepperrc, environ)
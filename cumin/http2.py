@@ -0,0 +1,108 @@
+"""
+An HTTP/2 transport for SaltApi, backed by httpx.
+
+Only the sliver of the requests interface that SaltApi and the SSE reader use is
+provided, with httpx's errors translated into their requests equivalents.
+
+Requires httpx with HTTP/2 support (the ``http2`` extra).
+"""
+import functools
+
+import httpx
+import requests
+
+
+class Http2Session:
+    """
+    Stands in for requests.Session. One HTTP/2 connection is multiplexed
+    between concurrent calls, so an open events() stream doesn't cost every
+    other call its own connection.
+
+    Only header-based auth handlers (ie, SaltTokenAuth) are supported.
+    """
+
+    def __init__(self, *, verify=True, headers=None, max_keepalive_connections=5):
+        self.client = httpx.Client(
+            http2=True,
+            verify=verify,
+            headers=headers,
+            limits=httpx.Limits(max_keepalive_connections=max_keepalive_connections),
+            # requests does this by default, and SaltApi relies on it
+            follow_redirects=True,
+        )
+
+    def close(self):
+        self.client.close()
+
+    def request(self, method, url, *, headers=None, verify=None, auth=None, data=None,
+                timeout=None, stream=False):
+        # verify is fixed when the client is built; httpx can't change it per request
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+        req = self.client.build_request(
+            method.upper(), url, headers=headers, content=data, timeout=timeout,
+        )
+        if auth is not None:
+            # requests-style handlers only get to touch the headers here
+            auth(req)
+        try:
+            resp = self.client.send(req, stream=stream)
+        except httpx.TransportError as exc:
+            raise requests.ConnectionError(str(exc)) from exc
+        return Http2Response(resp)
+
+    get = functools.partialmethod(request, 'get')
+    post = functools.partialmethod(request, 'post')
+
+
+class Http2Response:
+    """
+    Stands in for requests.Response.
+    """
+
+    def __init__(self, resp):
+        self._resp = resp
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def status_code(self):
+        return self._resp.status_code
+
+    @property
+    def url(self):
+        return str(self._resp.url)
+
+    @property
+    def headers(self):
+        return self._resp.headers
+
+    @property
+    def content(self):
+        return self._resp.read()
+
+    @property
+    def text(self):
+        self._resp.read()
+        return self._resp.text
+
+    def close(self):
+        self._resp.close()
+
+    def raise_for_status(self):
+        try:
+            self._resp.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            raise requests.HTTPError(str(exc)) from exc
+
+    def iter_content(self, chunk_size=None):
+        # Chunks are passed on as they arrive; asking httpx for a fixed
+        # chunk_size would hold back a short event until more data came.
+        try:
+            yield from self._resp.iter_bytes()
+        except httpx.TransportError as exc:
+            raise requests.ConnectionError(str(exc)) from exc
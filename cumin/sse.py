@@ -5,6 +5,64 @@ A requests-based Server-sent Events client implementation
 import requests
 import time
 
+_CHUNK_SIZE = 512
+
+
+def _iter_lines(chunks):
+    """
+    Splits a stream of byte chunks into lines, decoded as UTF-8.
+
+    Lines end in CRLF, LF, or CR (per
+    https://html.spec.whatwg.org/multipage/server-sent-events.html#parsing-an-event-stream).
+    Everything up to the last line ending in a chunk is decoded and split in one
+    go; only the unfinished tail is carried over to the next chunk. A CR ends
+    its line immediately, and an LF starting the next chunk is skipped as the
+    rest of that CRLF. An incomplete final line is dropped, as the event it
+    belongs to could never be dispatched anyway.
+    """
+    buf = bytearray()
+    skip_lf = False
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if skip_lf and chunk[0] == 0x0A:
+            chunk = chunk[1:]
+        if buf:
+            # The carried tail has no line ending in it, so only the new chunk
+            # is searched; a long line then costs linear, not quadratic, time.
+            start = len(buf)
+            buf += chunk
+            data = buf
+        else:
+            # Nothing carried over; work on the chunk itself, without copying
+            start = 0
+            data = chunk
+        end = data.rfind(b'\n', start)
+        cr = data.rfind(b'\r', max(end + 1, start))
+        if cr > end:
+            end = cr
+        if end < 0:
+            skip_lf = False
+            if data is chunk:
+                buf += chunk
+            continue
+        last = len(data) - 1
+        skip_lf = end == last and data[end] == 0x0D
+        # Line endings are ASCII, so this never splits a multi-byte character
+        if end == last:
+            text = data.decode('utf-8', 'replace')
+            if data is buf:
+                buf.clear()
+        else:
+            text = data[:end + 1].decode('utf-8', 'replace')
+            if data is buf:
+                del buf[:end + 1]
+            else:
+                buf += data[end + 1:]
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        yield from text[:-1].split('\n')
+
 
 def stream_raw_sse(mkrequest, *pargs, _last_event_id=None, headers=None, **kwargs):
     """
@@ -23,20 +81,20 @@ def stream_raw_sse(mkrequest, *pargs, _last_event_id=None, headers=None, **kwarg
 
     with mkrequest(*pargs, headers=headers, stream=True, **kwargs) as resp:
         fields = []
-        for line in resp.iter_lines(decode_unicode=True):
+        for line in _iter_lines(resp.iter_content(chunk_size=_CHUNK_SIZE)):
             # https://html.spec.whatwg.org/multipage/server-sent-events.html#event-stream-interpretation
             if not line:
                 yield fields
                 fields = []
-            elif line.startswith(':'):
+            elif line[0] == ':':
                 pass
-            elif ':' in line:
-                field, value = line.split(':', 1)
-                if value.startswith(' '):
+            else:
+                # Without a colon, the whole line is the field name and the
+                # value is empty, which partition() gives us for free.
+                field, _, value = line.partition(':')
+                if value[:1] == ' ':
                     value = value[1:]
-                fields += [(field, value)]
-            else:  # Non-blank, without a colon
-                fields += [(line, '')]
+                fields.append((field, value))
 
 
 def stream_sse(mkrequest, *pargs, **kwargs):
@@ -48,6 +48,9 @@ setup_kwargs = {
     ],
     'extras_require': {
         'kerberos': ['requests_kerberos'],
+        'speedups': ['orjson'],
+        'async': ['httpx[http2]'],
+        'http2': ['httpx[http2]'],
     },
     'keywords': 'salt saltstack salt-extension'
 }
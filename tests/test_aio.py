@@ -0,0 +1,70 @@
+import asyncio
+import functools
+
+import httpx
+import pytest
+import requests
+
+from cumin.api import AuthenticationDenied, ServerError
+from cumin.aio import SaltApiAsync
+
+
+def salt_api(request):
+    path = request.url.path
+    if path == '/login':
+        return httpx.Response(200, json={'return': [{'token': 'abc', 'eauth': 'pam'}]})
+    elif path == '/redirect':
+        return httpx.Response(302, headers={'Location': '/stats'})
+    elif path.startswith('/jobs/'):
+        return httpx.Response(int(path.rpartition('/')[2]), text='nope')
+    return httpx.Response(200, json={'return': [path]})
+
+
+@pytest.fixture
+def api(monkeypatch):
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return salt_api(request)
+
+    monkeypatch.setattr(httpx, 'AsyncClient', functools.partial(
+        httpx.AsyncClient, transport=httpx.MockTransport(handler),
+    ))
+    api = SaltApiAsync('http://salt')
+    api.sent = sent
+    yield api
+    asyncio.run(api.aclose())
+
+
+@pytest.mark.parametrize('status, exc', [
+    (401, AuthenticationDenied),
+    (500, ServerError),
+    (404, requests.HTTPError),
+])
+def test_errors(api, status, exc):
+    with pytest.raises(exc):
+        asyncio.run(api.jobs(str(status)))
+
+
+def test_follows_redirects(api):
+    resp = asyncio.run(api._mkrequest('GET', '/redirect'))
+    assert resp.json() == {'return': ['/stats']}
+
+
+def test_token_after_login(api):
+    async def login_and_run():
+        await api.login('saltdev', 'saltdev', 'pam')
+        await api.stats()
+    asyncio.run(login_and_run())
+    assert 'X-Auth-Token' not in api.sent[0].headers
+    assert api.sent[1].headers['X-Auth-Token'] == 'abc'
+
+
+def test_content_type_only_with_body(api):
+    async def calls():
+        await api.run([{'client': 'local', 'tgt': '*', 'fun': 'test.ping'}])
+        await api.stats()
+    asyncio.run(calls())
+    assert api.sent[0].headers['Content-Type'] == 'application/json'
+    assert 'Content-Type' not in api.sent[1].headers
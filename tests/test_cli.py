@@ -0,0 +1,9 @@
+from cumin.cli import PepperCli
+
+
+def test_format_response_is_stable():
+    # The output format mustn't depend on the data or on optional packages
+    cli = PepperCli()
+    assert cli.format_response({'b': 'café', 'a': 2 ** 70}) == (
+        '{\n    "a": 1180591620717411303424,\n    "b": "caf\\u00e9"\n}'
+    )
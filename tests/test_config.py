@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from cumin.config import standard_configuration, DEFAULT_SETTINGS
+
+
+def test_pepperrc(tmp_path):
+    rc = tmp_path / 'pepperrc'
+    rc.write_text('[main]\nSALTAPI_URL=https://salt:8000/\nSALTAPI_USER=saltdev\n')
+    config = standard_configuration(pepperrc=str(rc), environ={})
+    assert config['url'] == 'https://salt:8000/'
+    assert config['user'] == 'saltdev'
+
+
+def test_pepperrc_directory(tmp_path):
+    # Like ConfigParser.read(), anything that can't be read is just skipped
+    config = standard_configuration(pepperrc=str(tmp_path), environ={})
+    assert dict(config) == DEFAULT_SETTINGS
+
+
+@pytest.mark.skipif(os.geteuid() == 0, reason="root can read anything")
+def test_pepperrc_unreadable(tmp_path):
+    rc = tmp_path / 'pepperrc'
+    rc.write_text('[main]\nSALTAPI_USER=saltdev\n')
+    rc.chmod(0)
+    config = standard_configuration(pepperrc=str(rc), environ={})
+    assert dict(config) == DEFAULT_SETTINGS
+
+
+def test_pepperrc_read_error_not_cached(tmp_path, monkeypatch):
+    # Fixing permissions changes neither mtime nor size, so a failed read must
+    # not be remembered under them.
+    rc = tmp_path / 'pepperrc'
+    rc.write_text('[main]\nSALTAPI_USER=saltdev\n')
+    real_open = open
+
+    def denied(*pargs, **kwargs):
+        raise PermissionError(13, 'Permission denied')
+
+    monkeypatch.setattr('builtins.open', denied)
+    config = standard_configuration(pepperrc=str(rc), environ={})
+    assert dict(config) == DEFAULT_SETTINGS
+
+    monkeypatch.setattr('builtins.open', real_open)
+    config = standard_configuration(pepperrc=str(rc), environ={})
+    assert config['user'] == 'saltdev'
@@ -0,0 +1,75 @@
+import functools
+import json
+
+import httpx
+import pytest
+import requests
+
+from cumin.api import SaltApi, AuthenticationDenied, ServerError
+from cumin.sse import stream_raw_sse
+
+
+def salt_api(request):
+    path = request.url.path
+    if path == '/login':
+        return httpx.Response(200, json={'return': [{'token': 'abc', 'eauth': 'pam'}]})
+    elif path == '/redirect':
+        return httpx.Response(302, headers={'Location': '/stats'})
+    elif path.startswith('/jobs/'):
+        return httpx.Response(int(path.rpartition('/')[2]), text='nope')
+    elif path == '/events':
+        # Split mid-CRLF and mid-character, to be put back together by the reader
+        return httpx.Response(200, headers={'Content-Type': 'text/event-stream'}, content=iter([
+            b'data: caf\xc3', b'\xa9\r', b'\n\r\n', b'data: b\n\n',
+        ]))
+    return httpx.Response(200, json={'return': [path]})
+
+
+@pytest.fixture
+def api(monkeypatch):
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return salt_api(request)
+
+    monkeypatch.setattr(httpx, 'Client', functools.partial(
+        httpx.Client, transport=httpx.MockTransport(handler),
+    ))
+    with SaltApi('http://salt', transport='http2') as api:
+        api.sent = sent
+        yield api
+
+
+@pytest.mark.parametrize('status, exc', [
+    (401, AuthenticationDenied),
+    (500, ServerError),
+    (404, requests.HTTPError),
+])
+def test_errors(api, status, exc):
+    with pytest.raises(exc):
+        api.jobs(str(status))
+
+
+def test_follows_redirects(api):
+    with api._mkrequest('get', '/redirect') as resp:
+        assert json.loads(resp.content) == {'return': ['/stats']}
+
+
+def test_token_after_login(api):
+    api.login('saltdev', 'saltdev', 'pam')
+    api.stats()
+    assert 'X-Auth-Token' not in api.sent[0].headers
+    assert api.sent[1].headers['X-Auth-Token'] == 'abc'
+
+
+def test_content_type_only_with_body(api):
+    api.run([{'client': 'local', 'tgt': '*', 'fun': 'test.ping'}])
+    api.stats()
+    assert api.sent[0].headers['Content-Type'] == 'application/json'
+    assert 'Content-Type' not in api.sent[1].headers
+
+
+def test_events(api):
+    stream = stream_raw_sse(api._mkrequest, 'get', '/events')
+    assert [next(stream), next(stream)] == [[('data', 'café')], [('data', 'b')]]
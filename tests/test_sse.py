@@ -0,0 +1,48 @@
+from cumin.sse import stream_raw_sse
+
+
+class FakeResponse:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def iter_content(self, chunk_size=None):
+        yield from self.chunks
+
+
+def fake_mkrequest(chunks):
+    def mkrequest(*pargs, **kwargs):
+        return FakeResponse(chunks)
+    return mkrequest
+
+
+def events(chunks):
+    return list(stream_raw_sse(fake_mkrequest(chunks), 'get', '/events'))
+
+
+def test_crlf_split_across_chunks():
+    # The CR ends one chunk and its LF starts the next; that's one line ending,
+    # not a blank line dispatching an empty event.
+    assert events([b'retry: 10\r', b'\ndata: a\r\n\r\n']) == [
+        [('retry', '10'), ('data', 'a')],
+    ]
+
+
+def test_utf8_split_across_chunks():
+    # text/event-stream is always UTF-8, even split mid-character and without
+    # a charset in the Content-Type.
+    assert events([b'data: caf\xc3', b'\xa9\n\n']) == [[('data', 'café')]]
+
+
+def test_cr_dispatches_without_waiting_for_more_data():
+    def chunks():
+        yield b'data: a\r\r'
+        raise AssertionError("Read past the end of the event")
+
+    stream = stream_raw_sse(fake_mkrequest(chunks()), 'get', '/events')
+    assert next(stream) == [('data', 'a')]